@@ -70,6 +70,11 @@ class AppController:
         self.logger.info("OpenWebUI process shutdown complete")
 
     def _run_ingestion(self) -> None:
+        # Reload and profiling handlers are only installed once the loop runs;
+        # until then these signals must not fall back to killing the worker
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        signal.signal(signal.SIGUSR1, signal.SIG_IGN)
+
         try:
             self.logger.info("Starting KB ingestion process")
 
@@ -86,8 +91,18 @@ class AppController:
             shutdown.install_signal_handlers()
 
             ingestion_app = container.ingestion_process()
+            settings = container.settings()
+            diagnostics = container.diagnostics()
 
             async def resilient_loop() -> None:
+                # SIGHUP or an edit of the dotenv file retunes the running worker
+                settings.install_reload_handler()
+                watcher = asyncio.create_task(settings.watch())
+
+                # SIGUSR1 writes a task dump and a profile under logs/
+                diagnostics.install_profile_handler()
+                lag_monitor = asyncio.create_task(diagnostics.monitor_lag())
+
                 while not shutdown.stop_event.is_set():
                     try:
                         result: FutureResult[None, Exception] = ingestion_app.monitor_and_refresh_kbs(
@@ -98,7 +113,14 @@ class AppController:
 
                     await asyncio.sleep(1)
 
-            asyncio.run(resilient_loop())
+                watcher.cancel()
+                lag_monitor.cancel()
+                diagnostics.cancel_profile()
+
+            try:
+                asyncio.run(resilient_loop())
+            finally:
+                container.hasher().shutdown()
         except Exception:
             self.logger.exception(
                 "KBIngestion process crashed during initialization")
@@ -3,9 +3,11 @@ from pathlib import Path
 from dependency_injector import containers, providers
 
 from infrastructure.env import Env
-from infrastructure.logging import create_logger
-from infrastructure.fs import FileSystem, IFileSystem
+from infrastructure.diagnostics import LoopDiagnostics
+from infrastructure.logging import Logger, create_logger
+from infrastructure.fs import ContentHasher, FileSystem, IFileSystem
 from infrastructure.openwebui_connector import AIProvider, OpenWebUIConnector
+from infrastructure.settings import LiveSettings
 from application.ingest_knowledge_bases import KnowledgeBaseIngestionProcess
 from domain.knowledge_base.knowledge_base_manager import KnowledgeBaseManager
 
@@ -20,6 +22,19 @@ def get_from_env(env: Env, key: str) -> str | int | float | None:
     return env.vars.get(key)
 
 
+def settings_provider_func(path: str | Path, logger: Logger) -> LiveSettings:
+    settings = LiveSettings(dotenv_path=Path(path), logger=logger)
+    settings.reload().unwrap()
+    return settings
+
+
+def hasher_provider_func(settings: LiveSettings) -> ContentHasher:
+    return ContentHasher(
+        max_workers=settings.current.hash_workers,
+        max_cache_entries=settings.current.hash_cache_entries,
+    )
+
+
 def get_log_dir(root: Path) -> Path:
     return root / "logs"
 
@@ -47,6 +62,24 @@ class Container(containers.DeclarativeContainer):
         logfile_size_limit_mb=config.logfile_size_limit_MB,
     )
 
+    settings: providers.Singleton[LiveSettings] = providers.Singleton(
+        settings_provider_func,
+        path=config.dotenv_path,
+        logger=logger,
+    )
+
+    hasher: providers.Singleton[ContentHasher] = providers.Singleton(
+        hasher_provider_func,
+        settings=settings,
+    )
+
+    diagnostics: providers.Singleton[LoopDiagnostics] = providers.Singleton(
+        LoopDiagnostics,
+        log_dir=providers.Callable(get_log_dir, config.project_root),
+        settings=settings,
+        logger=logger,
+    )
+
     connector: providers.Singleton[AIProvider] = providers.Singleton(
         OpenWebUIConnector,
         base_url=providers.Callable(
@@ -60,6 +93,7 @@ class Container(containers.DeclarativeContainer):
             key="OPENWEBUI_API_KEY"
         ),
         logger=logger,
+        settings=settings,
     )
 
     # -------------------- Domain --------------------
@@ -69,6 +103,8 @@ class Container(containers.DeclarativeContainer):
         connector=connector,
         logger=logger,
         _embedded_files=providers.Object({}),
+        settings=settings,
+        hasher=hasher,
     )
 
     # -------------------- Application --------------------
@@ -77,5 +113,5 @@ class Container(containers.DeclarativeContainer):
         kb_manager=kb_manager,
         root=config.kb_root,
         logger=logger,
-        env=env,
+        settings=settings,
     )
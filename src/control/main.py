@@ -1,7 +1,10 @@
 # src/control/main.py
+import os
+import signal
 import logging
 from typing import Any
 from pathlib import Path
+from types import FrameType
 from dotenv import load_dotenv
 from returns.result import Success, Result
 
@@ -48,6 +51,15 @@ def execute_lifecycle(controller: AppController) -> None:
     openwebui_proc.start()
     ingestion_proc.start()
 
+    # Profiling (SIGUSR1) lives in the ingestion worker; forward it so
+    # signalling the launched process works too. SIGHUP is left alone: a
+    # terminal hangup already reaches the whole process group.
+    def forward_to_ingestion(signum: int, _: FrameType | None) -> None:
+        if ingestion_proc.pid is not None:
+            os.kill(ingestion_proc.pid, signum)
+
+    signal.signal(signal.SIGUSR1, forward_to_ingestion)
+
     openwebui_proc.join()
     ingestion_proc.join()
 
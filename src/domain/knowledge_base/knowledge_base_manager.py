@@ -1,14 +1,38 @@
 # domain/knowledge_base/knowledge_base_manager.py
+import asyncio
 import logging
+from typing import Any
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from returns.io import IOResult, IOSuccess, IOFailure
 from returns.future import FutureResult, future_safe
 from returns.result import Success, Failure
 
 from .kb_config import KnowledgeBaseConfig
-from infrastructure.fs import IFileSystem
-from infrastructure.openwebui_connector import AIProvider
+from infrastructure.fs import ContentHasher, IFileSystem
+from infrastructure.openwebui_connector import AIProvider, RemoteFile
+from infrastructure.pipeline import Limiter, Stage, iterate, run_pipeline
+from infrastructure.settings import IngestionSettings, LiveSettings
+
+
+@dataclass(frozen=True)
+class SyncItem:
+    """A local file travelling through the sync pipeline."""
+    path: Path
+    file_id: str = ""
+    digest: str = ""
+    # Remote file id this upload supersedes, removed once the new one is attached
+    replaces: str | None = None
+
+
+@dataclass
+class Reconciliation:
+    """Remote state of one KB, consumed as local files are discovered."""
+    # Newest remote entry per filename not yet matched by a local file
+    remote: dict[str, RemoteFile]
+    to_prune: list[str]
+    remote_total: int
+    local_files: int = 0
 
 
 @dataclass(frozen=True)
@@ -17,24 +41,45 @@ class KnowledgeBaseManager:
     connector: AIProvider
     _embedded_files: dict[str, set[str]]
     logger: logging.Logger
+    settings: LiveSettings = field(default_factory=LiveSettings)
+    hasher: ContentHasher = field(default_factory=ContentHasher)
+    _limiters: dict[str, Limiter] = field(init=False, default_factory=dict)
+    # Digest of the content behind remote file ids this worker uploaded as a
+    # replacement; bounded by HASH_CACHE_ENTRIES
+    _uploaded_digests: dict[str, str] = field(init=False, default_factory=dict)
 
     def __post_init__(self) -> None:
         object.__setattr__(self, "_embedded_files", {})
 
+        # Limiters outlive a single sync, so a settings reload resizes the
+        # stages that are running right now without touching in-flight files
+        current = self.settings.current
+        object.__setattr__(self, "_limiters", {
+            "upload": Limiter(current.upload_concurrency),
+            "process": Limiter(current.processing_concurrency),
+            "attach": Limiter(current.attach_concurrency),
+        })
+        self.settings.subscribe(self._apply_settings)
+
+    def _apply_settings(self, settings: IngestionSettings) -> None:
+        self._limiters["upload"].resize(settings.upload_concurrency)
+        self._limiters["process"].resize(settings.processing_concurrency)
+        self._limiters["attach"].resize(settings.attach_concurrency)
+
     def fetch_embedded_files(self) -> dict[str, set[str]]:
         return self._embedded_files.copy()
 
     def ingest_folder(
         self,
         folder: Path
-    ) -> list[FutureResult[None, Exception]]:
+    ) -> FutureResult[None, Exception] | None:
 
         try:
             config = KnowledgeBaseConfig.load(folder / "kbconfig.yaml")
         except Exception as e:
             self.logger.exception(
                 "Failed to load kbconfig for folder '%s': %s", folder, e)
-            return []
+            return None
 
         kb_name: str = config.name
 
@@ -60,47 +105,19 @@ class KnowledgeBaseManager:
                     raise RuntimeError("Unexpected KB resolution state")
 
             # 2. Fetch remote file list
-            remote_res: IOResult[list[str], Exception] = (
+            remote_res: IOResult[list[RemoteFile], Exception] = (
                 await self.connector.get_kb_files(kb_id).awaitable()
             )
 
             match remote_res:
-                case IOSuccess(Success(remote_filenames)):
-                    local_files: list[Path] = [
-                        f for f in self.fs.list_files(folder)
-                        if f.name != "kbconfig.yaml" and not f.name.startswith(".")
-                    ]
-
-                    to_upload: list[Path] = [
-                        f for f in local_files if f.name not in remote_filenames
-                    ]
-
-                    if not to_upload:
-                        self.logger.info(
-                            "KB '%s' is up to date.", kb_name)
-                        return
-
-                    self.logger.info(
-                        "Found %s files missing from KB '%s'.",
-                        len(to_upload), kb_name
+                case IOSuccess(Success(remote_list)):
+                    remote, duplicates = self._index_remote(remote_list)
+                    state = Reconciliation(
+                        remote=remote,
+                        to_prune=duplicates,
+                        remote_total=len(remote_list),
                     )
 
-                    for file in to_upload:
-                        res: IOResult[None, Exception] = (
-                            await self.connector.embed_file(kb_id, file).awaitable()
-                        )
-
-                        match res:
-                            case IOSuccess(Success(_)):
-                                self.logger.info(
-                                    "Successfully synced: %s", file.name)
-                            case IOFailure(Failure(err)):
-                                self.logger.error(
-                                    "Failed to sync file '%s': %s",
-                                    file.name, err)
-                            case _:
-                                pass
-
                 case IOFailure(Failure(e)):
                     self.logger.error(
                         "Could not fetch remote state for KB '%s': %s",
@@ -110,4 +127,216 @@ class KnowledgeBaseManager:
                 case _:
                     raise RuntimeError("Unexpected remote KB state")
 
-        return [orchestrate_ingestion()]
+            # 3. Stream discover -> diff -> upload -> process -> attach
+            synced: int = await run_pipeline(
+                iterate(self.fs.iter_files(folder, exclude=["kbconfig.yaml"])),
+                self._sync_stages(kb_id, state),
+            )
+
+            if synced:
+                self.logger.info(
+                    "Synced %s files into KB '%s'.", synced, kb_name)
+            else:
+                self.logger.info("KB '%s' is up to date.", kb_name)
+
+            # 4. Prune remote files deleted or superseded locally
+            to_prune = state.to_prune + self._deleted_locally(kb_name, state)
+            if to_prune:
+                self.logger.info(
+                    "Pruning %s stale files from KB '%s'.", len(to_prune), kb_name)
+                await self._prune(kb_id, to_prune)
+
+        return orchestrate_ingestion()
+
+    @staticmethod
+    def _index_remote(
+        remote_list: list[RemoteFile],
+    ) -> tuple[dict[str, RemoteFile], list[str]]:
+        """Keep the newest remote entry per filename; older duplicates are stale."""
+        remote: dict[str, RemoteFile] = {}
+        duplicates: list[str] = []
+        for entry in remote_list:
+            current = remote.get(entry.filename)
+            if current is None:
+                remote[entry.filename] = entry
+            elif entry.updated_at > current.updated_at:
+                duplicates.append(current.id)
+                remote[entry.filename] = entry
+            else:
+                duplicates.append(entry.id)
+        return remote, duplicates
+
+    def _deleted_locally(self, kb_name: str, state: Reconciliation) -> list[str]:
+        """
+        Remote files left unmatched by the local folder, unless removing them
+        looks like an empty or unmounted folder rather than real deletions.
+        """
+        if not state.remote:
+            return []
+
+        if not state.local_files:
+            self.logger.warning(
+                "No local files found for KB '%s'; not pruning its %s remote files.",
+                kb_name, len(state.remote))
+            return []
+
+        max_fraction = self.settings.current.prune_max_fraction
+        if len(state.remote) > max_fraction * state.remote_total:
+            self.logger.warning(
+                "Refusing to prune %s of %s files from KB '%s' (limit %.0f%%).",
+                len(state.remote), state.remote_total, kb_name, max_fraction * 100)
+            return []
+
+        return [entry.id for entry in state.remote.values()]
+
+    @staticmethod
+    def _is_superseded(file: Path, entry: RemoteFile) -> bool:
+        stat = file.stat()
+        if entry.size is not None and stat.st_size != entry.size:
+            return True
+        return stat.st_mtime > entry.updated_at
+
+    async def _prune(self, kb_id: str, file_ids: list[str]) -> None:
+        """Remove files in rate-limited batches so pruning never floods the server."""
+        start: int = 0
+        while start < len(file_ids):
+            if start:
+                await asyncio.sleep(self.settings.current.prune_interval)
+
+            batch = file_ids[start:start + self.settings.current.prune_batch_size]
+            start += len(batch)
+            res: IOResult[list[str], Exception] = (
+                await self.connector.remove_files(kb_id, batch).awaitable()
+            )
+            match res:
+                case IOSuccess(Success(removed)):
+                    for file_id in removed:
+                        self._uploaded_digests.pop(file_id, None)
+                    if len(removed) < len(batch):
+                        self.logger.warning(
+                            "Pruned %s of %s files from KB %s; the rest are retried next cycle",
+                            len(removed), len(batch), kb_id)
+                case IOFailure(Failure(err)):
+                    self.logger.error(
+                        "Failed to prune %s files from KB %s: %s",
+                        len(batch), kb_id, err)
+                case _:
+                    pass
+
+    def _remember_digest(self, file_id: str, digest: str) -> None:
+        # Bounded like the hasher's cache; dicts keep insertion order
+        if len(self._uploaded_digests) >= self.settings.current.hash_cache_entries:
+            self._uploaded_digests.pop(next(iter(self._uploaded_digests)))
+        self._uploaded_digests[file_id] = digest
+
+    def _sync_stages(
+        self,
+        kb_id: str,
+        state: Reconciliation,
+    ) -> list[Stage[Any, Any]]:
+        current = self.settings.current
+        workers = current.max_stage_workers
+
+        async def diff(file: Path) -> SyncItem | None:
+            if file.name.startswith("."):
+                return None
+            state.local_files += 1
+
+            # Whatever stays in state.remote has no local counterpart
+            entry = state.remote.pop(file.name, None)
+            if entry is None:
+                return SyncItem(path=file)
+            try:
+                superseded = self._is_superseded(file, entry)
+            except OSError as e:
+                # Deleted or renamed since discovery; the next cycle sees the new state
+                self.logger.warning(
+                    "Skipping file '%s' that changed during sync: %s", file.name, e)
+                return None
+            if superseded:
+                return SyncItem(path=file, replaces=entry.id)
+            return None
+
+        async def fingerprint(item: SyncItem) -> SyncItem | None:
+            # New files go straight to upload; only replacements are worth
+            # reading in full, to skip those that were touched but not changed
+            if not item.replaces:
+                return item
+
+            res: IOResult[str, Exception] = (
+                await self.hasher.hash_file(item.path).awaitable()
+            )
+            match res:
+                case IOSuccess(Success(digest)):
+                    # Touched but unchanged since our last upload: nothing to replace
+                    if self._uploaded_digests.get(item.replaces) == digest:
+                        return None
+                    return replace(item, digest=digest)
+                case IOFailure(Failure(err)):
+                    self.logger.error(
+                        "Failed to hash file '%s': %s", item.path.name, err)
+                case _:
+                    pass
+            return None
+
+        async def upload(item: SyncItem) -> SyncItem | None:
+            res: IOResult[str, Exception] = (
+                await self.connector.upload_file(item.path).awaitable()
+            )
+            match res:
+                case IOSuccess(Success(file_id)):
+                    return replace(item, file_id=file_id)
+                case IOFailure(Failure(err)):
+                    self.logger.error(
+                        "Failed to upload file '%s': %s", item.path.name, err)
+                case _:
+                    pass
+            return None
+
+        async def await_processing(item: SyncItem) -> SyncItem | None:
+            res: IOResult[None, Exception] = (
+                await self.connector.wait_for_processing(
+                    item.file_id, item.path.name).awaitable()
+            )
+            match res:
+                case IOSuccess(Success(_)):
+                    return item
+                case IOFailure(Failure(err)):
+                    self.logger.error(
+                        "Failed to process file '%s': %s", item.path.name, err)
+                case _:
+                    pass
+            return None
+
+        async def attach(item: SyncItem) -> SyncItem | None:
+            res: IOResult[None, Exception] = (
+                await self.connector.attach_file(
+                    kb_id, item.file_id, item.path.name).awaitable()
+            )
+            match res:
+                case IOSuccess(Success(_)):
+                    self.logger.info("Successfully synced: %s", item.path.name)
+                    if item.digest:
+                        self._remember_digest(item.file_id, item.digest)
+                    # The new version is attached; only now retire the old one
+                    if item.replaces:
+                        state.to_prune.append(item.replaces)
+                    return item
+                case IOFailure(Failure(err)):
+                    self.logger.error(
+                        "Failed to sync file '%s': %s", item.path.name, err)
+                case _:
+                    pass
+            return None
+
+        return [
+            Stage("diff", diff, queue_size=current.pipeline_queue_size),
+            Stage("hash", fingerprint, current.hash_workers,
+                  current.pipeline_queue_size),
+            Stage("upload", upload, workers, current.pipeline_queue_size,
+                  self._limiters["upload"]),
+            Stage("process", await_processing, workers, current.pipeline_queue_size,
+                  self._limiters["process"]),
+            Stage("attach", attach, workers, current.pipeline_queue_size,
+                  self._limiters["attach"]),
+        ]
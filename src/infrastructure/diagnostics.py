@@ -0,0 +1,88 @@
+# src/infrastructure/diagnostics.py
+import time
+import pstats
+import signal
+import asyncio
+import cProfile
+from pathlib import Path
+from dataclasses import dataclass
+
+from .logging import Logger
+from .settings import LiveSettings
+
+
+@dataclass
+class LoopDiagnostics:
+    """
+    Runtime diagnostics for an asyncio worker.
+
+    `monitor_lag` wakes up once per check interval and warns when the loop
+    was blocked past the threshold, so it costs one timer while idle.
+    SIGUSR1 dumps every task's stack and profiles the loop for
+    PROFILE_SECONDS; both reports are written under `log_dir`.
+    """
+    log_dir: Path
+    settings: LiveSettings
+    logger: Logger
+    _profile_task: asyncio.Task[None] | None = None
+
+    def install_profile_handler(self) -> None:
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGUSR1, self.trigger_profile)
+
+    def trigger_profile(self) -> None:
+        if self._profile_task is not None and not self._profile_task.done():
+            self.logger.warning("Profiling already in progress, ignoring trigger")
+            return
+        self._profile_task = asyncio.get_running_loop().create_task(self._profile())
+
+    async def monitor_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            interval = self.settings.current.loop_lag_check_interval
+            started = loop.time()
+            await asyncio.sleep(interval)
+
+            lag = loop.time() - started - interval
+            threshold = self.settings.current.loop_lag_threshold
+            if lag > threshold:
+                self.logger.warning(
+                    "Event loop blocked for %.3fs (threshold %.3fs)", lag, threshold)
+
+    def cancel_profile(self) -> None:
+        if self._profile_task is not None:
+            self._profile_task.cancel()
+
+    async def _profile(self) -> None:
+        try:
+            seconds = self.settings.current.profile_seconds
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+
+            tasks_path = self.log_dir / f"tasks-{stamp}.txt"
+            self._dump_tasks(tasks_path)
+            self.logger.info(
+                "Task dump written to %s, profiling for %ss", tasks_path, seconds)
+
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                profiler.disable()
+
+            prof_path = self.log_dir / f"profile-{stamp}.prof"
+            profiler.dump_stats(prof_path)
+            with open(self.log_dir / f"profile-{stamp}.txt", "w") as f:
+                pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(50)
+            self.logger.info("Profile written to %s", prof_path)
+        except Exception:
+            self.logger.exception("On-demand profiling failed")
+
+    @staticmethod
+    def _dump_tasks(path: Path) -> None:
+        with open(path, "w") as f:
+            for task in asyncio.all_tasks():
+                f.write(f"{task!r}\n")
+                task.print_stack(file=f)
+                f.write("\n")
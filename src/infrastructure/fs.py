@@ -1,6 +1,18 @@
 # src/infrastructure/fs.py
+import os
+import mmap
+import time
+import asyncio
+import hashlib
+import threading
 from pathlib import Path
-from typing import Protocol
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Protocol, TypeAlias
+from returns.future import FutureResult, future_safe
+
+# (st_dev, st_ino, st_size, st_mtime_ns): changes whenever the file content can
+FileKey: TypeAlias = tuple[int, int, int, int]
 
 class IFileSystem(Protocol):
     """Filesystem operations."""
@@ -11,6 +23,14 @@ class IFileSystem(Protocol):
     def list_files(self, folder: Path, exclude: list[str] = []) -> list[Path]:
         ...
 
+    def iter_subfolders(self, root: Path) -> Iterator[Path]:
+        """Lazily yield the subfolders of root."""
+        ...
+
+    def iter_files(self, folder: Path, exclude: list[str] = []) -> Iterator[Path]:
+        """Lazily yield the files in folder, without materialising the listing."""
+        ...
+
     def get_unembedded_files(self, folder: Path, embedded_files: set[str]) -> list[Path]:
         """Return files in folder that are not yet embedded."""
         ...
@@ -24,8 +44,111 @@ class FileSystem:
     def list_files(self, folder: Path, exclude: list[str] = []) -> list[Path]:
         return [f for f in folder.iterdir() if f.is_file() and f.name not in exclude]
 
+    def iter_subfolders(self, root: Path) -> Iterator[Path]:
+        """Lazily yield the subfolders of root."""
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    yield Path(entry.path)
+
+    def iter_files(self, folder: Path, exclude: list[str] = []) -> Iterator[Path]:
+        """Lazily yield the files in folder, without materialising the listing."""
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name not in exclude:
+                    yield Path(entry.path)
+
     def get_unembedded_files(self, folder: Path, embedded_files: set[str]) -> list[Path]:
         """Return files in folder that are not yet embedded."""
         files = self.list_files(folder, exclude=["kbconfig.yaml"])
         return [f for f in files if f.name not in embedded_files]
 
+
+@dataclass
+class HashStats:
+    """Bytes actually read and hashed, and the worker time spent doing it."""
+    bytes_hashed: int = 0
+    seconds: float = 0.0
+    cache_hits: int = 0
+
+    def throughput_gbps(self) -> float:
+        return self.bytes_hashed / self.seconds / 1e9 if self.seconds else 0.0
+
+
+@dataclass(frozen=True)
+class ContentHasher:
+    """
+    Content fingerprints for local files.
+
+    Files are memory-mapped and fed to hashlib without copying, on a thread
+    pool; hashlib releases the GIL while hashing, so workers run in parallel
+    and the event loop is never blocked. Digests are cached by stat key, so
+    an unchanged file is never read twice.
+    """
+    max_workers: int = 4
+    algorithm: str = "sha256"
+    max_cache_entries: int = 50_000
+    stats: HashStats = field(default_factory=HashStats)
+    _cache: dict[FileKey, str] = field(default_factory=dict)
+    _executor: ThreadPoolExecutor = field(init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_executor", ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="hasher"))
+
+    def hash_file(self, path: Path) -> FutureResult[str, Exception]:
+        @future_safe
+        async def _() -> str:
+            loop = asyncio.get_running_loop()
+            digest: str = await loop.run_in_executor(
+                self._executor, self._hash_cached, path)
+            return digest
+
+        return _()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    @staticmethod
+    def _stat_key(path: Path) -> FileKey:
+        stat = os.stat(path)
+        return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def _hash_cached(self, path: Path) -> str:
+        key = self._stat_key(path)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self.stats.cache_hits += 1
+                return cached
+
+        digest = self._hash_sync(path)
+
+        # A file written while it was read must not be cached under the old key
+        if self._stat_key(path) == key:
+            with self._lock:
+                if len(self._cache) >= self.max_cache_entries:
+                    # dicts keep insertion order: drop the oldest entry
+                    self._cache.pop(next(iter(self._cache)))
+                self._cache[key] = digest
+        return digest
+
+    def _hash_sync(self, path: Path) -> str:
+        started = time.perf_counter()
+        h = hashlib.new(self.algorithm)
+        size: int = 0
+
+        with open(path, "rb") as f:
+            # mmap can't map empty files; their digest is the empty digest
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                        memoryview(mm) as view:
+                    size = len(view)
+                    h.update(view)
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.stats.bytes_hashed += size
+            self.stats.seconds += elapsed
+        return h.hexdigest()
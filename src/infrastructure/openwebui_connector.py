@@ -1,13 +1,24 @@
 # src/infrastructure/openwebui_connector.py
 import httpx
 import asyncio
+from typing import Any
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
 from httpx import Response
 from returns.future import FutureResult, future_safe
 
 from .logging import Logger
+from .settings import LiveSettings
+
+
+@dataclass(frozen=True)
+class RemoteFile:
+    """A file attached to a knowledge base, as reported by the server."""
+    id: str
+    filename: str
+    size: int | None
+    updated_at: float
 
 
 class AIProvider(ABC):
@@ -23,7 +34,23 @@ class AIProvider(ABC):
         ...
 
     @abstractmethod
-    def get_kb_files(self, kb_id: str) -> FutureResult[list[str], Exception]:
+    def upload_file(self, path: Path) -> FutureResult[str, Exception]:
+        ...
+
+    @abstractmethod
+    def wait_for_processing(self, file_id: str, filename: str) -> FutureResult[None, Exception]:
+        ...
+
+    @abstractmethod
+    def attach_file(self, kb_id: str, file_id: str, filename: str) -> FutureResult[None, Exception]:
+        ...
+
+    @abstractmethod
+    def get_kb_files(self, kb_id: str) -> FutureResult[list[RemoteFile], Exception]:
+        ...
+
+    @abstractmethod
+    def remove_files(self, kb_id: str, file_ids: list[str]) -> FutureResult[list[str], Exception]:
         ...
 
 
@@ -32,6 +59,7 @@ class OpenWebUIConnector(AIProvider):
     base_url: str
     token: str
     logger: Logger
+    settings: LiveSettings = field(default_factory=LiveSettings)
 
     def __post_init__(self) -> None:
         self.logger.info(
@@ -48,7 +76,7 @@ class OpenWebUIConnector(AIProvider):
         async def _() -> dict[str, str]:
             clean_url = self.base_url.strip().rstrip("/")
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with httpx.AsyncClient(timeout=self.settings.current.http_timeout) as client:
                 r: Response = await client.get(
                     f"{clean_url}/api/v1/knowledge/",
                     headers={
@@ -73,12 +101,19 @@ class OpenWebUIConnector(AIProvider):
         kb_id: str,
         path: Path,
     ) -> FutureResult[None, Exception]:
+        return (
+            self.upload_file(path)
+            .bind(lambda file_id: self.wait_for_processing(file_id, path.name)
+                  .map(lambda _: file_id))
+            .bind(lambda file_id: self.attach_file(kb_id, file_id, path.name))
+        )
+
+    def upload_file(self, path: Path) -> FutureResult[str, Exception]:
         @future_safe
-        async def _() -> None:
+        async def _() -> str:
             clean_url = self.base_url.strip().rstrip("/")
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # 1. Upload File -------------------------------------------
+            async with httpx.AsyncClient(timeout=self.settings.current.http_timeout) as client:
                 self.logger.info("Uploading: %s", path.name)
                 with open(path, "rb") as f:
                     r = await client.post(
@@ -91,9 +126,21 @@ class OpenWebUIConnector(AIProvider):
                     )
                 r.raise_for_status()
                 file_id: str = r.json()["id"]
+                return file_id
+
+        return _()
 
-                # 2. Poll for 'completed' status --------------------------
-                max_retries = 10
+    def wait_for_processing(
+        self,
+        file_id: str,
+        filename: str,
+    ) -> FutureResult[None, Exception]:
+        @future_safe
+        async def _() -> None:
+            clean_url = self.base_url.strip().rstrip("/")
+
+            async with httpx.AsyncClient(timeout=self.settings.current.http_timeout) as client:
+                max_retries = self.settings.current.processing_max_retries
                 for i in range(max_retries):
                     status_res = await client.get(
                         f"{clean_url}/api/v1/files/{file_id}/process/status",
@@ -103,49 +150,118 @@ class OpenWebUIConnector(AIProvider):
                     status = status_res.json().get("status")
 
                     if status == "completed":
-                        break
+                        return
                     if status == "failed":
                         raise Exception(
                             "Embedding failed for file %s" % file_id)
 
                     self.logger.debug(
-                        "Waiting for embedding: %s (attempt %s)", path.name, i+1)
-                    await asyncio.sleep(2)
-                else:
-                    raise Exception(
-                        "Timeout waiting for file processing: %s" % file_id)
-
-                # 3. Add to Knowledge Base -------------------------------
-                self.logger.info("Attaching %s to KB %s", path.name, kb_id)
-                r2 = await client.post(
+                        "Waiting for embedding: %s (attempt %s)", filename, i+1)
+                    await asyncio.sleep(
+                        self.settings.current.processing_poll_interval)
+
+                raise Exception(
+                    "Timeout waiting for file processing: %s" % file_id)
+
+        return _()
+
+    def attach_file(
+        self,
+        kb_id: str,
+        file_id: str,
+        filename: str,
+    ) -> FutureResult[None, Exception]:
+        @future_safe
+        async def _() -> None:
+            clean_url = self.base_url.strip().rstrip("/")
+
+            async with httpx.AsyncClient(timeout=self.settings.current.http_timeout) as client:
+                self.logger.info("Attaching %s to KB %s", filename, kb_id)
+                r = await client.post(
                     f"{clean_url}/api/v1/knowledge/{kb_id}/file/add",
                     headers={
                         **self._headers(), "Content-Type": "application/json"},
                     json={"file_id": file_id}
                 )
-                r2.raise_for_status()
+                r.raise_for_status()
 
         return _()
 
-    def get_kb_files(self, kb_id: str) -> FutureResult[list[str], Exception]:
+    def get_kb_files(self, kb_id: str) -> FutureResult[list[RemoteFile], Exception]:
         @future_safe
-        async def _() -> list[str]:
+        async def _() -> list[RemoteFile]:
             self.logger.info("Fetching remote file list for KB: %s", kb_id)
-            async with httpx.AsyncClient() as client:
-                r: Response = await client.get(
-                    "%s/api/v1/knowledge/%s/files" % (self.base_url, kb_id),
-                    headers=self._headers()
-                )
-                r.raise_for_status()
+            files: dict[str, RemoteFile] = {}
 
-                # GET .../api/v1/knowledge/{id}/files responds with:
-                # {"items": [{"filename": "...", ...}]}
-                data = r.json()
-                items: list[dict[str, str]] = data.get("items", [])
+            async with httpx.AsyncClient(timeout=self.settings.current.http_timeout) as client:
+                # GET .../api/v1/knowledge/{id}/files is paginated and responds with:
+                # {"items": [{"id": "...", "filename": "...",
+                #             "meta": {"size": ...}, "updated_at": ...}],
+                #  "total": N}
+                page: int = 1
+                page_size: int = 0
+                while True:
+                    r: Response = await client.get(
+                        "%s/api/v1/knowledge/%s/files" % (self.base_url, kb_id),
+                        headers=self._headers(),
+                        params={"page": page},
+                    )
+                    r.raise_for_status()
+
+                    data = r.json()
+                    items: list[dict[str, Any]] = data.get("items", [])
+                    total: int | None = data.get("total")
+
+                    for item in items:
+                        if item and item.get("filename") and item.get("id"):
+                            files[item["id"]] = RemoteFile(
+                                id=item["id"],
+                                filename=item["filename"],
+                                size=(item.get("meta") or {}).get("size"),
+                                updated_at=item.get("updated_at")
+                                or item.get("created_at") or 0,
+                            )
+
+                    page_size = page_size or len(items)
+                    if not items or len(items) < page_size:
+                        break
+                    if total is not None and page * page_size >= total:
+                        break
+                    page += 1
+
+            return list(files.values())
+        return _()
+
+    def remove_files(
+        self,
+        kb_id: str,
+        file_ids: list[str],
+    ) -> FutureResult[list[str], Exception]:
+        @future_safe
+        async def _() -> list[str]:
+            clean_url = self.base_url.strip().rstrip("/")
+            removed: list[str] = []
+
+            async with httpx.AsyncClient(timeout=self.settings.current.http_timeout) as client:
+                self.logger.info(
+                    "Removing %s files from KB %s", len(file_ids), kb_id)
+
+                # One request at a time, so a batch never bursts the server
+                for file_id in file_ids:
+                    try:
+                        r = await client.post(
+                            f"{clean_url}/api/v1/knowledge/{kb_id}/file/remove",
+                            headers={
+                                **self._headers(), "Content-Type": "application/json"},
+                            json={"file_id": file_id}
+                        )
+                        r.raise_for_status()
+                    except httpx.HTTPError as e:
+                        self.logger.error(
+                            "Failed to remove file %s from KB %s: %s", file_id, kb_id, e)
+                        continue
+                    removed.append(file_id)
+
+            return removed
 
-                return [
-                    item.get("filename", "")
-                    for item in items
-                    if item and item.get("filename")
-                ]
         return _()
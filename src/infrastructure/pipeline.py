@@ -0,0 +1,173 @@
+# src/infrastructure/pipeline.py
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, AsyncIterable, Awaitable, Callable, Generic, Iterable, Sequence, TypeVar
+
+In = TypeVar("In")
+Out = TypeVar("Out")
+
+# Marks the end of a stage's input. One is queued per downstream worker.
+_DONE: Any = object()
+
+
+class Limiter:
+    """
+    A semaphore whose limit can be changed while it is held.
+
+    Shrinking the limit never interrupts current holders; it only keeps new
+    ones waiting until enough of them have released.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self._limit: int = max(1, limit)
+        self._active: int = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def resize(self, limit: int) -> None:
+        self._limit = max(1, limit)
+        self._wake()
+
+    async def acquire(self) -> None:
+        while self._active >= self._limit:
+            waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Pass on a wake-up this waiter received but can no longer use
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()
+                raise
+        self._active += 1
+
+    def release(self) -> None:
+        self._active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        free = self._limit - self._active
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.release()
+
+
+@dataclass(frozen=True)
+class Stage(Generic[In, Out]):
+    """
+    A single step of a streaming pipeline.
+
+    `handler` returning None drops the item; anything else is passed on to
+    the next stage. `queue_size` bounds the stage's input queue, so a slow
+    stage applies backpressure to everything upstream of it. With a
+    `limiter`, `concurrency` is only the worker ceiling and the limiter
+    decides how many handlers actually run at once.
+    """
+    name: str
+    handler: Callable[[In], Awaitable[Out | None]]
+    concurrency: int = 1
+    queue_size: int = 64
+    limiter: Limiter | None = None
+
+
+async def iterate(items: Iterable[In]) -> AsyncIterable[In]:
+    """Expose a (lazy) sync iterable as an async source, yielding the loop per item."""
+    for item in items:
+        yield item
+        await asyncio.sleep(0)
+
+
+async def run_pipeline(
+    source: AsyncIterable[Any],
+    stages: Sequence[Stage[Any, Any]],
+) -> int:
+    """
+    Stream items from `source` through `stages` over bounded queues.
+
+    Every stage runs `concurrency` workers, so work starts as soon as the
+    first item is discovered and memory is bounded by the queue sizes, not
+    by the size of the source. Returns the number of items that made it
+    through the last stage. A handler exception cancels the whole pipeline
+    and is re-raised as is.
+    """
+    if not stages:
+        return 0
+
+    queues: list[asyncio.Queue[Any]] = [
+        asyncio.Queue(maxsize=max(1, stage.queue_size)) for stage in stages
+    ]
+    completed: int = 0
+
+    async def produce() -> None:
+        async for item in source:
+            await queues[0].put(item)
+        for _ in range(max(1, stages[0].concurrency)):
+            await queues[0].put(_DONE)
+
+    async def run_stage(index: int) -> None:
+        nonlocal completed
+        stage = stages[index]
+        inbox = queues[index]
+        outbox = queues[index + 1] if index + 1 < len(queues) else None
+
+        async def worker() -> None:
+            nonlocal completed
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    return
+                if stage.limiter is None:
+                    result = await stage.handler(item)
+                else:
+                    async with stage.limiter:
+                        result = await stage.handler(item)
+                if result is None:
+                    continue
+                if outbox is None:
+                    completed += 1
+                else:
+                    await outbox.put(result)
+
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(max(1, stage.concurrency)):
+                tg.create_task(worker())
+
+        if outbox is not None:
+            for _ in range(max(1, stages[index + 1].concurrency)):
+                await outbox.put(_DONE)
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(produce())
+            for index in range(len(stages)):
+                tg.create_task(run_stage(index))
+    except BaseExceptionGroup as group:
+        # Surface the real cause instead of nested TaskGroup wrappers
+        raise _first_leaf(group)
+
+    return completed
+
+
+def _first_leaf(group: BaseExceptionGroup[BaseException]) -> BaseException:
+    first = group.exceptions[0]
+    if isinstance(first, BaseExceptionGroup):
+        return _first_leaf(first)
+    return first
@@ -0,0 +1,151 @@
+# src/infrastructure/settings.py
+import os
+import signal
+import asyncio
+from pathlib import Path
+from typing import Callable, Mapping
+from dataclasses import dataclass, field
+from dotenv import dotenv_values
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from returns.result import Result, Success, Failure, safe
+
+from .logging import Logger
+
+
+class IngestionSettings(BaseModel):
+    """
+    Performance knobs of the ingestion worker.
+
+    Every field is read from the upper-cased environment variable of the
+    same name (e.g. `upload_concurrency` <- UPLOAD_CONCURRENCY).
+    """
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+    # Sync loop
+    refresh_interval: float = Field(default=60.0, gt=0)
+    settings_watch_interval: float = Field(default=5.0, gt=0)
+
+    # Pipeline stages
+    upload_concurrency: int = Field(default=4, ge=1)
+    processing_concurrency: int = Field(default=8, ge=1)
+    attach_concurrency: int = Field(default=2, ge=1)
+    max_stage_workers: int = Field(default=64, ge=1)
+    pipeline_queue_size: int = Field(default=64, ge=1)
+
+    # Pruning
+    prune_batch_size: int = Field(default=20, ge=1)
+    prune_interval: float = Field(default=1.0, ge=0)
+    # Largest share of a KB one cycle may remove as deleted locally
+    prune_max_fraction: float = Field(default=0.5, gt=0, le=1)
+
+    # Hashing (applied at startup only)
+    hash_workers: int = Field(default=4, ge=1)
+    hash_cache_entries: int = Field(default=50_000, ge=1)
+
+    # OpenWebUI client
+    http_timeout: float = Field(default=30.0, gt=0)
+    processing_poll_interval: float = Field(default=2.0, gt=0)
+    processing_max_retries: int = Field(default=10, ge=1)
+
+    # Diagnostics
+    loop_lag_check_interval: float = Field(default=1.0, gt=0)
+    loop_lag_threshold: float = Field(default=0.25, gt=0)
+    profile_seconds: float = Field(default=30.0, gt=0)
+
+    @model_validator(mode="after")
+    def _within_worker_ceiling(self) -> "IngestionSettings":
+        for name in ("upload_concurrency", "processing_concurrency", "attach_concurrency"):
+            if getattr(self, name) > self.max_stage_workers:
+                raise ValueError(
+                    f"{name.upper()} exceeds MAX_STAGE_WORKERS ({self.max_stage_workers})")
+        return self
+
+    @classmethod
+    def from_mapping(cls, values: Mapping[str, str | None]) -> "IngestionSettings":
+        return cls.model_validate({
+            name: values[name.upper()]
+            for name in cls.model_fields
+            if values.get(name.upper())
+        })
+
+
+@dataclass
+class LiveSettings:
+    """
+    Holds the current `IngestionSettings` and swaps them on reload.
+
+    Reloads are triggered by SIGHUP or by a change of the dotenv file.
+    Variables set in the process environment take precedence over the file.
+    An invalid file is logged and ignored, keeping the previous settings.
+    Subscribers are called with the new settings after every change.
+    """
+    dotenv_path: Path | None = None
+    logger: Logger | None = None
+    current: IngestionSettings = field(default_factory=lambda: IngestionSettings())
+    _subscribers: list[Callable[[IngestionSettings], None]] = field(default_factory=list)
+    _mtime_ns: int = 0
+    # First value seen for each dotenv key; load_dotenv copies these into os.environ
+    _dotenv_origin: dict[str, str | None] = field(default_factory=dict)
+
+    def subscribe(self, callback: Callable[[IngestionSettings], None]) -> None:
+        self._subscribers.append(callback)
+
+    def reload(self) -> Result[IngestionSettings, Exception]:
+        result = self._load()
+
+        match result:
+            case Success(settings):
+                if settings != self.current:
+                    self.current = settings
+                    if self.logger:
+                        self.logger.info("Ingestion settings reloaded: %s", settings)
+                    for callback in self._subscribers:
+                        callback(settings)
+
+            case Failure(e):
+                if self.logger:
+                    self.logger.error(
+                        "Invalid ingestion settings, keeping previous ones: %s", e)
+
+            case _:
+                pass
+
+        return result
+
+    def install_reload_handler(self) -> None:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, self.reload)
+
+    async def watch(self) -> None:
+        """Poll the dotenv file and reload whenever it changes."""
+        while True:
+            await asyncio.sleep(self.current.settings_watch_interval)
+            mtime_ns = self._file_mtime_ns()
+            if mtime_ns != self._mtime_ns:
+                self.reload()
+
+    @safe
+    def _load(self) -> IngestionSettings:
+        self._mtime_ns = self._file_mtime_ns()
+        file_values: dict[str, str | None] = {}
+        if self.dotenv_path is not None and self._mtime_ns:
+            file_values = dict(dotenv_values(self.dotenv_path))
+        for key, value in file_values.items():
+            self._dotenv_origin.setdefault(key, value)
+
+        # Like load_dotenv, real environment variables win over the file.
+        # Values load_dotenv copied in from the file are not "real": they are
+        # dropped so that edits and removed lines in the file take effect.
+        values: dict[str, str | None] = dict(file_values)
+        values.update({
+            k: v for k, v in os.environ.items()
+            if k not in self._dotenv_origin or self._dotenv_origin[k] != v
+        })
+        return IngestionSettings.from_mapping(values)
+
+    def _file_mtime_ns(self) -> int:
+        if self.dotenv_path is None:
+            return 0
+        try:
+            return self.dotenv_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return 0